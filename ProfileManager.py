@@ -1,5 +1,5 @@
 from selenium.common.exceptions import TimeoutException
-from tenacity import retry, retry_if_exception_type, stop_after_attempt
+from tenacity import retry_if_exception_type
 
 from DataModels.InsuranceData import InsuranceData
 from Enums.Service.LogLevel import LogLevel
@@ -16,19 +16,69 @@ from PageObjects.profile_extension_page import ExtensionPageLocators
 from PageObjects.profile_osago_settings_page import OsagoSettingsPageLocators
 from PageObjects.profile_personal_page import PersonalPageLocators
 from TestManagers.RegistrationManager import RegistrationManager
+from TestManagers.RetryPolicyManager import retry_policy
 from TestManagers.Validators.Profile import Profile
 
 
+class ProfileTabs(Tabs):
+    """Класс-расширение для работы с несколькими вкладками одной сессии браузера"""
+
+    def __init__(self, browser):
+        super().__init__(browser)
+        self.browser = browser
+
+    def current(self):
+        """Дескриптор текущей вкладки"""
+        return self.browser.current_window_handle
+
+    def switch_to(self, handle):
+        """Переход на вкладку по дескриптору"""
+        self.browser.switch_to.window(handle)
+
+    def open_new_tab(self):
+        """
+        Открытие пустой новой вкладки и переход на нее
+
+        :return: дескриптор открытой вкладки
+        :rtype: str
+        """
+        self.browser.switch_to.new_window('tab')
+        return self.current()
+
+    def load(self, url):
+        """Загрузка страницы в текущей вкладке"""
+        self.browser.get(url)
+
+    def close_tabs(self, handles, return_to):
+        """
+        Закрытие вкладок и возврат на указанную вкладку
+
+        :param handles: дескрипторы закрываемых вкладок
+        :type handles: list
+        :param return_to: дескриптор вкладки, на которую нужно вернуться
+        :type return_to: str
+        :return: None
+        :rtype: None
+        """
+        for handle in handles:
+            self.switch_to(handle)
+            self.browser.close()
+        self.switch_to(return_to)
+
+
 class ProfileManager:
     """Менеджер для управления профилем и настройками пользователя"""
 
+    __page_urls = {}
+    "Адреса страниц профиля, открытых в новой вкладке, по названию в боковом меню"
+
     def __init__(self, browser):
         self.browser = browser
         self.wait = Waiting(self.browser)
         "Класс-расширение для работы с ожиданиями"
         self.elementEx = ElementEx(self.browser)
         "Класс-расширение для элементов страницы"
-        self.tabs = Tabs(self.browser)
+        self.tabs = ProfileTabs(self.browser)
         "Класс-расширение для работы со вкладками"
         self.datePickerEx = DatePickerEx(self.browser)
         "Класс-расширение для выбора даты из календаря"
@@ -53,6 +103,12 @@ class ProfileManager:
         Log.trace("Открытие вкладки", LogLevel.MANAGER)
         self.elementEx.find_and_click(locator)
 
+    @staticmethod
+    def __run_steps(steps):
+        """Выполнение шагов в текущей вкладке без переключения на другие"""
+        for _ in steps:
+            pass
+
     # endregion Общее
 
     # region Личные данные
@@ -62,7 +118,7 @@ class ProfileManager:
         Log.trace("Дозаполнение модели данных пользователя", LogLevel.MANAGER)
         AgentNewData.generate(agent_data)
 
-    @retry(retry=retry_if_exception_type(TimeoutException), reraise=True, stop=stop_after_attempt(2))
+    @retry_policy.retry("set_personal_info", retry_if_exception_type(TimeoutException), attempts=2)
     def __set_personal_info(self, agent_data):
         """Изменение имени, населенного пункта и типа АЗ пользователя"""
         Log.trace("Изменение имени, населенного пункта и типа АЗ пользователя", LogLevel.MANAGER)
@@ -73,7 +129,7 @@ class ProfileManager:
         self.elementEx.find_and_click(self.profile_page_loc.USER_INFO_SAVE_BTN)
         self.windowsEx.close_popup(PopupType.SUCCESS)
 
-    @retry(retry=retry_if_exception_type(TimeoutException), reraise=True, stop=stop_after_attempt(2))
+    @retry_policy.retry("set_phone", retry_if_exception_type(TimeoutException), attempts=2)
     def __set_phone(self, agent_data):
         """Изменение телефона пользователя"""
         Log.trace("Изменение телефона пользователя", LogLevel.MANAGER)
@@ -86,7 +142,7 @@ class ProfileManager:
         self.windowsEx.close_popup(PopupType.SUCCESS)
         agent_data.phone = agent_data.new_phone
 
-    @retry(retry=retry_if_exception_type(TimeoutException), reraise=True, stop=stop_after_attempt(2))
+    @retry_policy.retry("set_email", retry_if_exception_type(TimeoutException), attempts=2)
     def __set_email(self, agent_data):
         """Изменение адреса электронной почты пользователя"""
         Log.trace("Изменение адреса электронной почты пользователя", LogLevel.MANAGER)
@@ -96,7 +152,7 @@ class ProfileManager:
         self.elementEx.find_and_click(self.profile_page_loc.EMAIL_SAVE_BTN)
         self.windowsEx.close_popup(PopupType.SUCCESS)
 
-    @retry(retry=retry_if_exception_type(TimeoutException), reraise=True, stop=stop_after_attempt(2))
+    @retry_policy.retry("set_password", retry_if_exception_type(TimeoutException), attempts=2)
     def __set_password(self, agent_data):
         """Изменение пароля пользователя"""
         Log.trace("Изменение пароля пользователя", LogLevel.MANAGER)
@@ -107,6 +163,24 @@ class ProfileManager:
         self.windowsEx.close_popup(PopupType.SUCCESS)
         agent_data.password = agent_data.new_pass
 
+    def __user_info_steps(self, agent_data):
+        """
+        Шаги изменения личных данных пользователя
+
+        Каждый шаг, включая ожидание сообщения об успешном сохранении, выполняется целиком
+        с повторами; между шагами управление возвращается вызывающему коду
+
+        :param agent_data: модель данных агента
+        :type agent_data: AgentData
+        :return: генератор, приостанавливающийся после каждого шага
+        :rtype: Generator
+        """
+        self.__precondition(agent_data)
+        for set_step in (self.__set_personal_info, self.__set_phone,
+                         self.__set_email, self.__set_password):
+            set_step(agent_data)
+            yield
+
     def set_user_info(self, agent_data):
         """
         Изменение личных данных пользователя
@@ -116,11 +190,7 @@ class ProfileManager:
         :return: ProfileManager
         :rtype: ProfileManager
         """
-        self.__precondition(agent_data)
-        self.__set_personal_info(agent_data)
-        self.__set_phone(agent_data)
-        self.__set_email(agent_data)
-        self.__set_password(agent_data)
+        self.__run_steps(self.__user_info_steps(agent_data))
         return self
 
     def delete_account(self):
@@ -202,14 +272,14 @@ class ProfileManager:
         self.elementEx.find_and_click(self.insurance_page_loc.GENERAL_SAVE_BTN)
         self.windowsEx.close_popup(PopupType.SUCCESS)
 
-    def set_osago_preferences(self, agent_data):
+    def __osago_preferences_steps(self, agent_data):
         """
-        Настройка параметров СК и агрегаторов пользователя
+        Шаги настройки параметров СК и агрегаторов пользователя
 
         :param agent_data: модель данных агента
         :type agent_data: AgentData
-        :return: ProfileManager
-        :rtype: ProfileManager
+        :return: генератор, приостанавливающийся после сохранения каждой группы настроек
+        :rtype: Generator
         """
         Log.trace("Изменение настроек СК и агрегаторов", LogLevel.MANAGER)
         for group in (agent_data.insurances, agent_data.aggregators):
@@ -234,6 +304,7 @@ class ProfileManager:
                 Log.trace("Подключение не выбранной ранее СК", LogLevel.MANAGER)
                 self.__activate(agent_data.insurance_enable)
                 self.__save_settings()
+                yield
 
             elif group == agent_data.aggregators:
                 Log.trace("Отключение выбранного ранее агрегатора", LogLevel.MANAGER)
@@ -246,7 +317,102 @@ class ProfileManager:
                 Log.trace("Подключение не выбранного ранее агрегатора", LogLevel.MANAGER)
                 self.__activate(agent_data.aggregator_enable)
                 self.__save_settings()
+                yield
+
+    def set_osago_preferences(self, agent_data):
+        """
+        Настройка параметров СК и агрегаторов пользователя
 
+        :param agent_data: модель данных агента
+        :type agent_data: AgentData
+        :return: ProfileManager
+        :rtype: ProfileManager
+        """
+        self.__run_steps(self.__osago_preferences_steps(agent_data))
         return self
 
     # endregion Настройки ОСАГО
+
+    # region Настройка профиля в нескольких вкладках
+    def __autocomplete_mode_steps(self, mode):
+        """Шаги выбора типа АЗ в настройках расширения"""
+        self.set_autocomplete_mode(mode)
+        yield
+
+    def __open_in_new_tab(self, manager, page, handles):
+        """
+        Открытие страницы профиля в новой вкладке той же сессии браузера
+
+        Страница загружается по адресу, запомненному при первом открытии из бокового меню
+
+        :param manager: основной менеджер приложения
+        :type manager: ApplicationManager
+        :param page: название страницы в боковом меню
+        :type page: str
+        :param handles: дескрипторы открытых вкладок; вкладка добавляется до загрузки страницы
+        :type handles: list
+        :return: дескриптор открытой вкладки
+        :rtype: str
+        """
+        Log.trace(f"Открытие страницы {page} в новой вкладке", LogLevel.MANAGER)
+        site_url = self.browser.current_url
+        handles.append(self.tabs.open_new_tab())
+        if page in self.__page_urls:
+            self.tabs.load(self.__page_urls[page])
+        else:
+            self.tabs.load(site_url)
+            manager.open_page_from_sidebar(page=page)
+            self.__page_urls[page] = self.browser.current_url
+        return handles[-1]
+
+    def __run_in_tabs(self, steps):
+        """
+        Поочередное выполнение шагов в нескольких вкладках
+
+        Вкладки переключаются только между завершенными шагами: каждый шаг дожидается
+        подтверждения сохранения до перехода в другую вкладку
+
+        :param steps: пары (дескриптор вкладки, генератор шагов)
+        :type steps: list
+        :return: None
+        :rtype: None
+        """
+        while steps:
+            for handle, tab_steps in list(steps):
+                self.tabs.switch_to(handle)
+                try:
+                    next(tab_steps)
+                except StopIteration:
+                    steps.remove((handle, tab_steps))
+
+    def set_settings_in_tabs(self, manager, agent_data):
+        """
+        Изменение личных данных, настроек расширения и настроек ОСАГО в отдельных вкладках
+
+        Результат совпадает с последовательным вызовом set_user_info, set_autocomplete_mode
+        и set_osago_preferences; по завершении открытые дополнительные вкладки закрываются
+
+        :param manager: основной менеджер приложения
+        :type manager: ApplicationManager
+        :param agent_data: модель данных агента
+        :type agent_data: AgentData
+        :return: ProfileManager
+        :rtype: ProfileManager
+        """
+        Log.trace("Изменение личных данных и настроек пользователя в нескольких вкладках",
+                  LogLevel.MANAGER)
+        manager.open_page_from_sidebar(page='personal_settings')
+        main_handle = self.tabs.current()
+        new_handles = []
+        try:
+            osago_handle = self.__open_in_new_tab(manager, 'osago_settings', new_handles)
+            ext_handle = self.__open_in_new_tab(manager, 'ext_settings', new_handles)
+            self.__run_in_tabs([
+                (main_handle, self.__user_info_steps(agent_data)),
+                (osago_handle, self.__osago_preferences_steps(agent_data)),
+                (ext_handle, self.__autocomplete_mode_steps(agent_data.autocomplete))])
+        finally:
+            self.tabs.close_tabs(new_handles, main_handle)
+        return self
+
+    # endregion Настройка профиля в нескольких вкладках
@@ -3,7 +3,7 @@ from copy import deepcopy
 from pathlib import Path
 
 import pytest
-from tenacity import retry, wait_fixed, stop_after_attempt, retry_if_exception_type
+from tenacity import retry_if_exception_type
 
 # Импорты внутри проекта
 from Enums.Service.LogLevel import LogLevel
@@ -19,6 +19,7 @@ from Helpers.TextInputHelper import TextInputHelper
 from PageObjects.login_page import LoginPageLocators
 from PageObjects.registration_page import RegistrationPage, RegistrationPageLocators
 from TestManagers.DB.AutoTestDBManager import AutoTestDBManager
+from TestManagers.RetryPolicyManager import retry_policy
 from TestManagers.Validators.Registration import Registration
 
 path = Path(__file__).parents[1].joinpath('config.json')
@@ -59,7 +60,9 @@ class RegistrationManager:
         """Открытие страницы регистрации"""
         Log.trace("Открытие страницы регистрации", LogLevel.MANAGER)
         self.reg_page.open()
-        self.wait.element_present(RegistrationPageLocators.LAST_NAME, WaitingTime.LONG)
+        with retry_policy.measure("registration_page"):
+            self.wait.element_present(RegistrationPageLocators.LAST_NAME,
+                                      retry_policy.timeout("registration_page", WaitingTime.LONG))
         self.validator.is_registration_page()
         return self
 
@@ -67,7 +70,9 @@ class RegistrationManager:
         """Открытие страницы регистрации со страницы авторизации"""
         Log.trace("Открытие страницы регистрации со страницы авторизации", LogLevel.MANAGER)
         self.elementEx.find_and_click(LoginPageLocators.REGISTER_LINK)
-        self.wait.element_present(RegistrationPageLocators.LAST_NAME, WaitingTime.LONG)
+        with retry_policy.measure("registration_page"):
+            self.wait.element_present(RegistrationPageLocators.LAST_NAME,
+                                      retry_policy.timeout("registration_page", WaitingTime.LONG))
         self.validator.is_registration_page()
         return self
 
@@ -167,8 +172,8 @@ class RegistrationManager:
             .__send_to_register()
         return self
 
-    @retry(retry=retry_if_exception_type(AssertionError), wait=wait_fixed(0.5),
-           reraise=True, stop=stop_after_attempt(3))
+    @retry_policy.retry("get_code", retry_if_exception_type(AssertionError), attempts=3, wait=0.5,
+                        polling=True)
     def get_code(self, agent_data):
         """
         Получение СМС-кода из БД для регистрации или изменения логина
@@ -189,8 +194,8 @@ class RegistrationManager:
             f"\nТелефон {phone}"
         agent_data.sms_code = info_from_db['code']
 
-    @retry(retry=retry_if_exception_type(AssertionError), wait=wait_fixed(0.5),
-           reraise=True, stop=stop_after_attempt(3))
+    @retry_policy.retry("get_password", retry_if_exception_type(AssertionError), attempts=3, wait=0.5,
+                        polling=True)
     def __get_password(self, agent_data):
         """
         Получение пароля для входа в личный кабинет
@@ -233,7 +238,9 @@ class RegistrationManager:
         :rtype: RegistrationManager
         """
         Log.trace("Заполнение формы и отправка запроса на регистрацию", LogLevel.MANAGER)
-        self.wait.element_present(self.reg_page_loc.LAST_NAME, WaitingTime.LONG)
+        with retry_policy.measure("registration_form"):
+            self.wait.element_present(self.reg_page_loc.LAST_NAME,
+                                      retry_policy.timeout("registration_form", WaitingTime.LONG))
         self.__fill_and_send(agent_data) \
             .__confirm_registration(agent_data)
         # Ожидание перехода на главную страницу
@@ -0,0 +1,236 @@
+import json
+import math
+import time
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+
+from tenacity import retry
+
+from Enums.Service.LogLevel import LogLevel
+from Extensions.Log import Log
+
+path = Path(__file__).parents[1].joinpath('retry_history.json')
+
+
+class RetryPolicy:
+    """
+    Адаптивная политика повторов для шагов, обернутых в tenacity
+
+    Для шагов-действий сохраняется время успешной попытки, для шагов, ожидающих появления
+    данных (polling), - время от первой попытки до успеха. Пока истории недостаточно,
+    используются заданные в коде число попыток и пауза. После накопления истории сверх
+    заданного числа попыток шаг повторяется, пока не истечет время, рассчитанное как
+    percentile * margin, а пауза шагов polling растет вместе с медианным временем появления
+    данных, но не меньше заданной. Дополнительные попытки ограничены бюджетом теста;
+    заданное в коде число попыток бюджет не уменьшает
+    """
+
+    MIN_SAMPLES = 10
+    "Минимальный объем истории шага для перехода на адаптивную политику"
+    HISTORY_SIZE = 200
+    "Количество последних измерений, хранимых для каждого шага"
+    MAX_ATTEMPTS_FACTOR = 3
+    "Во сколько раз адаптивная политика может превысить заданное в коде число попыток"
+    POLLING_WAIT_SHARE = 0.25
+    "Доля медианного времени появления данных, используемая как пауза шага polling"
+
+    def __init__(self, store=path, percentile=99, margin=1.5, test_budget=10):
+        self.store = store
+        "Файл с историей выполнения шагов"
+        self.percentile = percentile
+        "Перцентиль времени успешного выполнения, от которого считается таймаут"
+        self.margin = margin
+        "Запас, на который умножается перцентиль"
+        self.test_budget = test_budget
+        "Количество дополнительных попыток, доступное всем шагам одного теста"
+        self.history = self.__load()
+        "Время успешного выполнения шагов в секундах"
+        self.__retries_left = test_budget
+
+    # region История
+    def __load(self):
+        """Загрузка истории из локального хранилища"""
+        if not self.store.exists():
+            return {}
+        # Недоступная или поврежденная история не должна мешать запуску тестов
+        try:
+            with self.store.open() as f:
+                history = json.load(f)
+        except (OSError, ValueError) as e:
+            Log.trace(f"История выполнения шагов не прочитана и будет собрана заново: {e}",
+                      LogLevel.FUNCT)
+            return {}
+        if not self.__is_valid(history):
+            Log.trace("История выполнения шагов имеет неверный формат и будет собрана заново",
+                      LogLevel.FUNCT)
+            return {}
+        return history
+
+    @staticmethod
+    def __is_valid(history):
+        """Проверка формата истории: словарь списков чисел по названиям шагов"""
+        return isinstance(history, dict) and all(
+            isinstance(durations, list)
+            and all(isinstance(value, (int, float)) for value in durations)
+            for durations in history.values())
+
+    def save(self):
+        """Сохранение истории в локальное хранилище через временный файл"""
+        Log.trace("Сохранение истории выполнения шагов", LogLevel.FUNCT)
+        temp = self.store.with_name(self.store.name + '.tmp')
+        with temp.open('w') as f:
+            json.dump(self.history, f, ensure_ascii=False, indent=2)
+        temp.replace(self.store)
+
+    def record(self, step, duration):
+        """
+        Сохранение времени успешного выполнения шага
+
+        :param step: название шага
+        :type step: str
+        :param duration: время выполнения в секундах
+        :type duration: float
+        :return: None
+        :rtype: None
+        """
+        durations = self.history.setdefault(step, [])
+        durations.append(round(duration, 3))
+        del durations[:-self.HISTORY_SIZE]
+
+    @contextmanager
+    def measure(self, step):
+        """Измерение времени выполнения блока; время сохраняется только при успешном выполнении"""
+        start = time.monotonic()
+        yield
+        self.record(step, time.monotonic() - start)
+
+    def __quantile(self, step, percentile):
+        """
+        Перцентиль времени выполнения шага
+
+        :return: значение в секундах или None, если истории недостаточно
+        :rtype: float | None
+        """
+        durations = sorted(self.history.get(step, []))
+        if len(durations) < self.MIN_SAMPLES:
+            return None
+        return durations[math.ceil(percentile / 100 * len(durations)) - 1]
+
+    def __limit(self, step):
+        """
+        Время выполнения шага по истории: percentile * margin
+
+        :return: значение в секундах или None, если истории недостаточно
+        :rtype: float | None
+        """
+        observed = self.__quantile(step, self.percentile)
+        return None if observed is None else observed * self.margin
+
+    # endregion История
+
+    # region Политика
+    def timeout(self, step, default):
+        """
+        Таймаут ожидания по истории выполнения
+
+        Таймаут не бывает меньше значения по умолчанию: ожидание завершается, как только
+        условие выполнено, поэтому короткий таймаут не ускоряет тест, а только превращает
+        медленную загрузку в ошибку. По истории таймаут только увеличивается
+
+        :param step: название шага
+        :type step: str
+        :param default: таймаут, заданный в коде
+        :type default: WaitingTime | float
+        :return: таймаут по истории в секундах, если он больше заданного, иначе заданный
+        :rtype: WaitingTime | float
+        """
+        limit = self.__limit(step)
+        if limit is None or limit <= getattr(default, 'value', default):
+            return default
+        return limit
+
+    def start_test(self):
+        """Восстановление бюджета повторов перед тестом"""
+        self.__retries_left = self.test_budget
+
+    def __stop(self, step, attempts, wait, polling):
+        """Условие прекращения повторов для tenacity"""
+        def stop(retry_state):
+            if retry_state.attempt_number < attempts:
+                return False
+            if retry_state.attempt_number >= attempts * self.MAX_ATTEMPTS_FACTOR:
+                return True
+            if self.__retries_left <= 0:
+                Log.trace(f"Бюджет дополнительных попыток теста исчерпан: {step}", LogLevel.FUNCT)
+                return True
+            limit = self.__limit(step)
+            if limit is None:
+                return True
+            # Шаг polling повторяется, пока данные обычно успевают появиться; шаг-действие -
+            # пока не истекло время, которое заданные попытки заняли бы по истории
+            window = limit if polling else attempts * (limit + wait)
+            return retry_state.seconds_since_start >= window
+        return stop
+
+    def __wait(self, step, wait, polling):
+        """Пауза между попытками для tenacity"""
+        def wait_before_retry(retry_state):
+            median = self.__quantile(step, 50)
+            # Шагам-действиям, например повторам после TimeoutException, пауза не добавляется
+            if not polling or median is None:
+                return wait
+            return max(wait, median * self.POLLING_WAIT_SHARE)
+        return wait_before_retry
+
+    def __spend_budget(self, attempts):
+        """Списание дополнительной попытки из бюджета теста перед паузой tenacity"""
+        def spend(retry_state):
+            if retry_state.attempt_number >= attempts:
+                self.__retries_left -= 1
+        return spend
+
+    def retry(self, step, retry_condition, attempts, wait=0, polling=False):
+        """
+        Декоратор повторов шага с адаптивной политикой
+
+        :param step: название шага в истории
+        :type step: str
+        :param retry_condition: условие повтора tenacity, например retry_if_exception_type
+        :param attempts: число попыток; при накопленной истории допускаются дополнительные попытки
+        :type attempts: int
+        :param wait: минимальная пауза между попытками в секундах
+        :type wait: float
+        :param polling: шаг ожидает появления данных, например СМС-кода в БД; в историю
+            сохраняется время от первой попытки до успеха, а не время одной попытки
+        :type polling: bool
+        :return: декоратор
+        """
+        def decorator(func):
+            retrying = retry(retry=retry_condition, reraise=True,
+                             stop=self.__stop(step, attempts, wait, polling),
+                             wait=self.__wait(step, wait, polling),
+                             before_sleep=self.__spend_budget(attempts))
+
+            if polling:
+                measured = retrying(func)
+
+                @wraps(func)
+                def wrapper(*args, **kwargs):
+                    with self.measure(step):
+                        return measured(*args, **kwargs)
+                return wrapper
+
+            # Измеряется только успешная попытка, без неудачных попыток
+            @wraps(func)
+            def attempt(*args, **kwargs):
+                with self.measure(step):
+                    return func(*args, **kwargs)
+            return retrying(attempt)
+        return decorator
+
+    # endregion Политика
+
+
+retry_policy = RetryPolicy()
+"Общая политика повторов для менеджеров тестов"
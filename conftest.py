@@ -0,0 +1,14 @@
+import pytest
+
+from TestManagers.RetryPolicyManager import retry_policy
+
+
+@pytest.fixture(scope="session", autouse=True)
+def retry_history():
+    yield
+    retry_policy.save()
+
+
+@pytest.fixture(autouse=True)
+def retry_budget():
+    retry_policy.start_test()
@@ -33,17 +33,8 @@ def test_registration(manager):
 
 
 def test_profile_setup(manager, prepare_and_fin):
-    Log.trace("ИЗМЕНЕНИЕ ЛИЧНЫХ ДАННЫХ ПОЛЬЗОВАТЕЛЯ")
-    manager.open_page_from_sidebar(page='personal_settings') \
-        .profile_manager.set_user_info(prepare_and_fin)
-
-    Log.trace("ИЗМЕНЕНИЕ НАСТРОЕК РАСШИРЕНИЯ")
-    manager.open_page_from_sidebar(page='ext_settings') \
-        .profile_manager.set_autocomplete_mode(prepare_and_fin.autocomplete)
-
-    Log.trace("ИЗМЕНЕНИЕ НАСТРОЕК ОСАГО")
-    manager.open_page_from_sidebar(page='osago_settings') \
-        .profile_manager.set_osago_preferences(prepare_and_fin)
+    Log.trace("ИЗМЕНЕНИЕ ЛИЧНЫХ ДАННЫХ, НАСТРОЕК РАСШИРЕНИЯ И НАСТРОЕК ОСАГО")
+    manager.profile_manager.set_settings_in_tabs(manager, prepare_and_fin)
 
     Log.trace("ПРОВЕРКА ИЗМЕНЕНИЯ ЛИЧНЫХ ДАННЫХ И НАСТРОЕК ПОЛЬЗОВАТЕЛЯ")
     manager.login_manager.logout() \